@@ -1,4 +1,4 @@
-$Action = New-ScheduledTaskAction -Execute "C:\Python313\python.exe" -Argument '-u "F:\Python_Projects\Auto_YT_DL\auto_yt_live.py"' -WorkingDirectory "F:\Python_Projects\Auto_YT_DL"
+$Action = New-ScheduledTaskAction -Execute "C:\Python313\python.exe" -Argument '-u "F:\Python_Projects\Auto_YT_DL\yt_watcher.py"' -WorkingDirectory "F:\Python_Projects\Auto_YT_DL"
 $Trigger = New-ScheduledTaskTrigger -Daily -At 8:30AM
 
 # --- UPDATED SETTINGS ---
@@ -0,0 +1,791 @@
+# yt_watcher.py
+"""
+Handles YouTube channel live detection including scheduled (upcoming) streams.
+Monitors the /live endpoint directly and records streams when they become available.
+With --upload (or UPLOAD_ENABLED=1), completed recordings are moved to Google Drive via rclone.
+"""
+
+import argparse
+import asyncio
+import functools
+import http.cookiejar
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import re
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
+
+import diskcache
+import httpx
+import yt_dlp
+from yt_dlp.utils import DownloadError
+
+# --- Configuration (env overrides) ---
+DEBUG = True
+CHANNEL_URL = os.getenv("CHANNEL_URL", "https://www.youtube.com/@parmarssc/live")
+CHECK_INTERVAL = int(os.getenv("CHECK_INTERVAL", "15"))
+QUIET_LOG_INTERVAL = int(os.getenv("QUIET_LOG_INTERVAL", "120"))
+HEARTBEAT_INTERVAL = int(os.getenv("HEARTBEAT_INTERVAL", "300"))
+PROGRESS_PRINT_INTERVAL = 0.2  # seconds between progress line refreshes
+IDLE_BACKOFF_MAX = int(os.getenv("IDLE_BACKOFF_MAX", "300"))  # cap for exponential back-off while idle
+UPCOMING_POLL_MIN = int(os.getenv("UPCOMING_POLL_MIN", "5"))
+UPCOMING_POLL_MAX = int(os.getenv("UPCOMING_POLL_MAX", "600"))
+IMMINENT_WINDOW = int(os.getenv("IMMINENT_WINDOW", "60"))  # poll densely this close to a scheduled start
+IMMINENT_POLL_INTERVAL = int(os.getenv("IMMINENT_POLL_INTERVAL", "2"))
+QUICK_SCAN_CACHE_TTL = int(os.getenv("QUICK_SCAN_CACHE_TTL", "60"))
+DEEP_SCAN_CACHE_TTL = int(os.getenv("DEEP_SCAN_CACHE_TTL", "10"))
+QUICK_SCAN_MAX_BYTES = 1024 * 1024  # give up on the plain-HTTP channel scan after this much HTML
+META_CACHE_DIR = os.getenv("META_CACHE_DIR", "./.cache/meta")  # on-disk scan results; outside OUT_DIR so rclone leaves it alone
+META_CACHE_TTL = int(os.getenv("META_CACHE_TTL", "86400"))
+META_CACHE_SIZE_LIMIT = 50 * 1024 * 1024
+UPCOMING_RECHECK_INTERVAL = int(os.getenv("UPCOMING_RECHECK_INTERVAL", "3600"))  # deep-scan a known upcoming stream this often
+UPCOMING_TRUST_LEAD = int(os.getenv("UPCOMING_TRUST_LEAD", "600"))  # ...and on every poll once it is this close to starting
+OUT_DIR = os.getenv("OUT_DIR", "./downloads")
+OUT_TEMPLATE = os.path.join(OUT_DIR, "%(upload_date)s - %(title)s - %(id)s.%(ext)s")
+YTDLP_CACHE_DIR = os.getenv("YTDLP_CACHE_DIR", "./.cache/yt-dlp")  # player JS cache; keep it outside OUT_DIR
+MAX_RUN_SECONDS = int(os.getenv("MAX_RUN_SECONDS", "0"))  # 0 => no limit
+LIVE_FROM_START_MAX_LAG = int(os.getenv("LIVE_FROM_START_MAX_LAG", "600"))  # joined later than this => record from now
+RECORDER_MIN_RUN = int(os.getenv("RECORDER_MIN_RUN", "60"))  # a recorder exiting sooner (or non-zero) counts as failed
+RECORD_FORMAT = os.getenv("RECORD_FORMAT", "bv*[height<=1080]+ba/b[height<=1080]/b")  # cap resolution to bound disk use
+CONCURRENT_FRAGMENTS = int(os.getenv("CONCURRENT_FRAGMENTS", "4"))  # parallel HLS/DASH fragment downloads
+
+# --- rclone Configuration ---
+UPLOAD_ENABLED = os.getenv("UPLOAD_ENABLED", "0") == "1"  # --upload / --no-upload override this
+RCLONE_REMOTE_NAME = "gdrive"
+GDRIVE_FOLDER = os.getenv("GDRIVE_UPLOAD_FOLDER", "YTUploads")
+UPLOAD_TIMEOUT = int(os.getenv("UPLOAD_TIMEOUT", "1800"))
+UPLOAD_SWEEP_INTERVAL = int(os.getenv("UPLOAD_SWEEP_INTERVAL", "1800"))  # periodic catch-all `rclone move`
+UPLOAD_BATCH_WINDOW = int(os.getenv("UPLOAD_BATCH_WINDOW", "10"))  # recordings finishing this close share one rclone run
+UPLOAD_READY_MIN_AGE = int(os.getenv("UPLOAD_READY_MIN_AGE", "30"))  # seconds untouched before a file counts as finished
+
+# --- NEW: Cookie Configuration ---
+COOKIE_FILE = os.getenv("COOKIE_FILE_PATH")
+COOKIES_EXIST = COOKIE_FILE and os.path.exists(COOKIE_FILE) and os.path.getsize(COOKIE_FILE) > 0
+# --- END NEW ---
+
+# --- Setup ---
+logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO, stream=sys.stdout,
+                    format="[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+for noisy in ("asyncio", "httpx", "httpcore"):
+    logging.getLogger(noisy).setLevel(logging.WARNING)  # per-request chatter
+log = logging.getLogger(__name__)
+
+os.makedirs(OUT_DIR, exist_ok=True)
+YTDLP_CMD_BASE = [sys.executable, "-m", "yt_dlp", "--cache-dir", YTDLP_CACHE_DIR]
+RECORDED_MARKER = "[recorded] "  # prefix of the final file path yt-dlp prints once a recording is done
+
+# --- MODIFIED: Add cookie argument to subprocess command ---
+if COOKIES_EXIST:
+    log.info(f"Using cookies from {COOKIE_FILE}")
+    YTDLP_CMD = YTDLP_CMD_BASE + ["--cookies", COOKIE_FILE]
+else:
+    log.warning("WARNING: No cookie file found or file empty. Running unauthenticated.")
+    YTDLP_CMD = YTDLP_CMD_BASE
+# --- END MODIFIED ---
+
+start_time = datetime.now()
+end_time = start_time + timedelta(seconds=MAX_RUN_SECONDS) if MAX_RUN_SECONDS > 0 else None
+
+def seconds_left() -> float:
+    """Time remaining before MAX_RUN_SECONDS is reached (infinite when unlimited)."""
+    if not end_time:
+        return float("inf")
+    return max((end_time - datetime.now()).total_seconds(), 0)
+
+# --- Helper Functions ---
+_scan_cache: Dict[Tuple[str, bool], Tuple[float, Dict[str, Any]]] = {}
+
+def _is_imminent(result: Dict[str, Any]) -> bool:
+    scheduled_start = result.get("scheduled_start_time")
+    return result.get("status") == "upcoming" and bool(scheduled_start) and scheduled_start - time.time() < IMMINENT_WINDOW
+
+def cached_scan(func):
+    """
+    Memoizes scan results per (url, deep_scan) for QUICK/DEEP_SCAN_CACHE_TTL seconds.
+    Errors and streams about to start are never cached so state changes aren't masked.
+    """
+    @functools.wraps(func)
+    async def wrapper(video_url: str, deep_scan: bool = False) -> Dict[str, Any]:
+        key = (video_url, deep_scan)
+        ttl = DEEP_SCAN_CACHE_TTL if deep_scan else QUICK_SCAN_CACHE_TTL
+        hit = _scan_cache.get(key)
+        if hit and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+        result = await func(video_url, deep_scan)
+        if result.get("status") == "error" or _is_imminent(result):
+            _scan_cache.pop(key, None)
+        else:
+            _scan_cache[key] = (time.monotonic(), result)
+        return result
+    return wrapper
+
+def invalidate_scan_cache(video_url: Optional[str] = None):
+    """Drops cached scans for one URL (both scan depths), or everything."""
+    if video_url is None:
+        _scan_cache.clear()
+        return
+    for deep_scan in (False, True):
+        _scan_cache.pop((video_url, deep_scan), None)
+
+_meta_cache = diskcache.Cache(META_CACHE_DIR, size_limit=META_CACHE_SIZE_LIMIT)
+
+def remember_status(result: Dict[str, Any]):
+    """
+    Persists deep-scan results for upcoming streams by video ID, so a restarted watcher
+    doesn't have to rediscover them. Any other status drops the entry.
+    """
+    video_id = result.get("video_id")
+    if not video_id:
+        return
+    if result.get("status") == "upcoming" and result.get("scheduled_start_time"):
+        _meta_cache.set(video_id, {**result, "checked_at": time.time()}, expire=META_CACHE_TTL)
+    else:
+        _meta_cache.delete(video_id)
+
+def known_upcoming(video_id: str) -> Optional[Dict[str, Any]]:
+    """
+    The remembered status of an upcoming stream, if it is recent enough and the start far
+    enough away that a deep scan can be skipped; otherwise None. Only consult it while the
+    channel page itself still says upcoming, so an early start is not masked.
+    """
+    hit = _meta_cache.get(video_id)
+    if not hit:
+        return None
+    now = time.time()
+    if now - hit["checked_at"] > UPCOMING_RECHECK_INTERVAL or hit["scheduled_start_time"] - now < UPCOMING_TRUST_LEAD:
+        return None
+    return hit
+
+class _WarningCollector:
+    """yt-dlp logger that keeps warnings, which carry the reason a video has no formats."""
+    def __init__(self):
+        self.warnings: List[str] = []
+
+    def debug(self, msg: str):
+        pass
+
+    info = debug
+
+    def warning(self, msg: str):
+        self.warnings.append(msg)
+
+    error = warning
+
+def _build_ydl(extract_flat: bool) -> yt_dlp.YoutubeDL:
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": extract_flat,
+        "cachedir": YTDLP_CACHE_DIR,
+    }
+    if not extract_flat:
+        # Upcoming streams have no formats; keep their metadata (start time) instead of raising
+        ydl_opts["ignore_no_formats_error"] = True
+        ydl_opts["logger"] = _WarningCollector()
+    if COOKIES_EXIST:
+        ydl_opts["cookiefile"] = COOKIE_FILE
+    return yt_dlp.YoutubeDL(ydl_opts)
+
+# Long-lived extractors: building a YoutubeDL per scan re-initialises extractors and the HTTP session
+_YDL_FLAT = _build_ydl(extract_flat=True)
+_YDL_DEEP = _build_ydl(extract_flat=False)
+_YDL_LOCK = threading.Lock()  # YoutubeDL is not thread-safe and scans run in worker threads
+
+def _extract_info(video_url: str, deep_scan: bool) -> Optional[Dict[str, Any]]:
+    """Blocking yt-dlp extraction; run it off the event loop via asyncio.to_thread."""
+    ydl = _YDL_DEEP if deep_scan else _YDL_FLAT
+    with _YDL_LOCK:
+        collector = ydl.params.get("logger")
+        if collector:
+            collector.warnings.clear()
+        info = ydl.extract_info(video_url, download=False)
+        if info and collector and collector.warnings:
+            info["_scan_warnings"] = list(collector.warnings)
+        return info
+
+# Video ID quoted in yt-dlp errors, e.g. "[youtube] abcdefghijk: This live event will begin..."
+_YT_ID_RE = re.compile(r"\[youtube\]\s*([A-Za-z0-9_-]{11})")
+# The /live page of a live or scheduled channel is that video's watch page
+_CANONICAL_RE = re.compile(rb'<link rel="canonical" href="([^"]+)"')
+_WATCH_URL_RE = re.compile(rb"/watch\?v=([A-Za-z0-9_-]{11})")
+# From the page's player response: videoDetails (with isUpcoming) comes before the microformat's isLiveNow
+_LIVE_NOW_RE = re.compile(rb'"isLiveNow":(true|false)')
+_UPCOMING_RE = re.compile(rb'"isUpcoming":true')
+_HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+_http_client: Optional[httpx.AsyncClient] = None
+
+def _load_cookie_jar() -> Optional[http.cookiejar.CookieJar]:
+    if not COOKIES_EXIST:
+        return None
+    jar = http.cookiejar.MozillaCookieJar(COOKIE_FILE)
+    try:
+        jar.load(ignore_discard=True, ignore_expires=True)
+    except (OSError, http.cookiejar.LoadError) as e:
+        log.warning(f"WARNING: Could not load cookies for quick scans: {e}")
+        return None
+    return jar
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=15,
+            headers=_HTTP_HEADERS,
+            cookies=_load_cookie_jar(),
+        )
+    return _http_client
+
+async def _quick_channel_scan(channel_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Reads just enough of the channel's /live page to learn which video it points at and,
+    when the player response is within reach, whether that video is still upcoming
+    ("page_upcoming"; absent if the page didn't say).
+    Returns None when the page can't be understood so the caller can fall back to yt-dlp.
+    """
+    buf = bytearray()
+    match = None
+    live_now = None
+    try:
+        async with _get_http_client().stream("GET", channel_url) as resp:
+            if resp.status_code != 200:
+                return None
+            async for chunk in resp.aiter_bytes(chunk_size=16384):
+                # Only rescan the tail so a tag split across chunks is still found
+                start = max(len(buf) - 256, 0)
+                buf += chunk
+                match = match or _CANONICAL_RE.search(buf, start)
+                live_now = live_now or _LIVE_NOW_RE.search(buf, start)
+                if match and (live_now or not _WATCH_URL_RE.search(match.group(1))):
+                    break
+                if len(buf) >= QUICK_SCAN_MAX_BYTES:
+                    break
+    except httpx.HTTPError as e:
+        log.debug("Quick HTTP scan failed: %s", e)
+        return None
+
+    if not match:
+        return None
+    watch = _WATCH_URL_RE.search(match.group(1))
+    if not watch:
+        return {"status": "not_live"}
+    video_id = watch.group(1).decode()
+    log.debug("Quick scan found video ID '%s'. Needs deep scan.", video_id)
+    result = {"status": "inconclusive", "video_id": video_id}
+    if live_now:
+        result["page_upcoming"] = live_now.group(1) == b"false" and bool(_UPCOMING_RE.search(buf, 0, live_now.start()))
+    return result
+
+def _classify(info: Optional[Dict[str, Any]], deep_scan: bool) -> Dict[str, Any]:
+    """Maps a yt-dlp info dict onto a status dict. Pure apart from debug logging."""
+    if not info: return {"status": "not_live"}
+
+    video_id = info.get("id")
+    title = info.get("title")
+    if info.get("is_upcoming") or info.get("live_status") == 'is_upcoming':
+        log.debug("Status for '%s': UPCOMING", title or video_id)
+        return {"status": "upcoming", "video_id": video_id, "title": title,
+                "scheduled_start_time": info.get("release_timestamp")}
+    if deep_scan and not info.get("formats"):
+        # Only upcoming streams are expected to lack formats; anything else (bot check, geo block) is a failure
+        reason = " ".join(info.get("_scan_warnings") or ["No video formats found"])
+        log.debug("Status for '%s': ERROR (%s)", title or video_id, reason)
+        return {"status": "error", "video_id": video_id, "title": title, "errmsg": reason}
+    if info.get("is_live"):
+        log.debug("Status for '%s': LIVE", title or video_id)
+        return {"status": "live", "video_id": video_id, "title": title,
+                "started_at": info.get("release_timestamp")}
+    if not deep_scan and video_id:
+        log.debug("Quick scan found video ID '%s'. Needs deep scan.", video_id)
+        return {"status": "inconclusive", "video_id": video_id, "title": title}
+    log.debug("Status for '%s': NOT LIVE", title or video_id)
+    return {"status": "not_live", "video_id": video_id, "title": title}
+
+def _scan_error(msg: str, result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Error status for a failed scan, flagging cookie failures loudly."""
+    # --- NEW: Catch cookie errors specifically ---
+    if "Sign in to confirm you're not a bot" in msg:
+         log.critical("CRITICAL: Cookie authentication failed. Update YT_COOKIES secret.")
+         msg = "Cookie authentication failed"
+    # --- END NEW ---
+    return {**(result or {}), "status": "error", "errmsg": msg}
+
+@cached_scan
+async def get_video_info(video_url: str, deep_scan: bool = False) -> Dict[str, Any]:
+    """Gets info for a video/live stream URL (fast HTTP path for channel scans, else yt-dlp)."""
+    try:
+        log.debug("Performing %s scan for: %s", "DEEP" if deep_scan else "QUICK", video_url)
+        if not deep_scan:
+            fast_info = await _quick_channel_scan(video_url)
+            if fast_info is not None:
+                return fast_info
+        info = await asyncio.to_thread(_extract_info, video_url, deep_scan)
+        result = _classify(info, deep_scan)
+        if result["status"] == "error":
+            return _scan_error(result["errmsg"], result)
+        return result
+    except DownloadError as e:
+        msg = str(e)
+        if "live event will begin" in msg:
+            m = _YT_ID_RE.search(msg)
+            vid = m.group(1) if m else None
+            return {"status": "upcoming", "video_id": vid, "errmsg": msg}
+        return _scan_error(msg)
+    except Exception as e:
+        return {"status": "error", "errmsg": str(e)}
+
+async def start_record(video_url: str, from_start: bool = True) -> Optional[asyncio.subprocess.Process]:
+    try:
+        cmd = YTDLP_CMD + [
+            "--no-warnings",
+            "--newline",
+            "--no-overwrites",
+            *(["--live-from-start"] if from_start else []),
+            "--hls-use-mpegts",
+            "-f", RECORD_FORMAT,
+            "--concurrent-fragments", str(CONCURRENT_FRAGMENTS),
+            "--buffer-size", "16K",
+            "--http-chunk-size", "10M",
+            # A live stream can't be resumed later, so ride out transient errors instead of exiting
+            "--retries", "infinite",
+            "--fragment-retries", "infinite",
+            "--progress",
+            "--print", f"after_move:{RECORDED_MARKER}%(filepath)s",
+            "-o", OUT_TEMPLATE,
+            video_url
+        ]
+        log.debug("Starting download command: %s", " ".join(cmd))
+        # Own process group, so stopping the recorder also reaches the ffmpeg it spawns
+        if os.name == "nt":
+            group_opts = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group_opts = {"start_new_session": True}
+        return await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT, **group_opts)
+    except Exception as e:
+        log.debug("Error starting download: %s", e)
+        return None
+
+def _signal_recorder(proc: asyncio.subprocess.Process, force: bool = False):
+    """
+    Terminates (or with force, kills) the recorder's whole process group.
+    Windows has no killpg, so there only the yt-dlp process itself is signalled.
+    """
+    try:
+        if os.name == "nt":
+            proc.kill() if force else proc.terminate()
+        else:
+            os.killpg(proc.pid, signal.SIGKILL if force else signal.SIGTERM)
+    except ProcessLookupError:
+        pass  # the whole group has already exited
+
+_upload_lock = asyncio.Lock()  # one rclone at a time per OUT_DIR
+# Resolved once at startup; each upload only appends its --files-from-raw list
+_RCLONE_BIN = shutil.which("rclone")
+_RCLONE_UPLOAD_CMD = [
+    _RCLONE_BIN or "rclone", "move", OUT_DIR, f"{RCLONE_REMOTE_NAME}:{GDRIVE_FOLDER}",
+    "--no-traverse",
+    "--drive-chunk-size", "64M",
+    "--transfers", "4",
+    "--checkers", "8",
+    "--stats", "60s", "--stats-one-line", "-v",
+]
+
+async def _stream_rclone(proc: asyncio.subprocess.Process) -> int:
+    async for raw in proc.stdout:
+        log.info("rclone: %s", raw.decode(errors="replace").rstrip())
+    return await proc.wait()
+
+async def _run_rclone(args: List[str]):
+    """Runs the rclone upload command with extra args, streaming its log. Callers hold _upload_lock."""
+    try:
+        upload_cmd = _RCLONE_UPLOAD_CMD + args
+        log.info(f"Running upload: {' '.join(upload_cmd)}")
+
+        up_proc = await asyncio.create_subprocess_exec(*upload_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+        try:
+            returncode = await asyncio.wait_for(_stream_rclone(up_proc), timeout=UPLOAD_TIMEOUT)
+        except asyncio.TimeoutError:
+            up_proc.kill()
+            await up_proc.wait()
+            raise
+
+        if returncode == 0:
+            log.info("Upload complete.")
+        else:
+            log.error(f"ERROR during upload. rclone exited with {returncode}.")
+
+    except asyncio.TimeoutError:
+        log.error(f"ERROR: rclone upload timed out after {UPLOAD_TIMEOUT} seconds.")
+    except Exception as e:
+        log.error(f"UNEXPECTED ERROR during upload: {str(e)}")
+
+async def _ready_files(min_age: float) -> List[str]:
+    """
+    Names of files in OUT_DIR that look safe to upload: untouched for min_age seconds and
+    not growing across a one-second sample. A recorder stalled in its retries also looks
+    like that, so unfinished .part files are only included by the shutdown sweep
+    (min_age == 0), once no recorder is left to resume them.
+    """
+    cutoff = time.time() - min_age
+    sizes: Dict[str, int] = {}
+    with os.scandir(OUT_DIR) as entries:
+        for entry in entries:
+            # yt-dlp's per-fragment scratch files are never worth uploading
+            if not entry.is_file() or ".part-Frag" in entry.name or entry.name.endswith(".ytdl"):
+                continue
+            if min_age and entry.name.endswith(".part"):
+                continue
+            st = entry.stat()
+            if st.st_mtime < cutoff:
+                sizes[entry.name] = st.st_size
+    if not sizes:
+        return []
+    await asyncio.sleep(1)
+    ready = []
+    for name, size in sizes.items():
+        try:
+            if os.stat(os.path.join(OUT_DIR, name)).st_size == size:
+                ready.append(name)
+        except FileNotFoundError:
+            pass  # moved away meanwhile
+    return ready
+
+def recordings_of(video_id: str) -> List[str]:
+    """Paths of finished-looking files in OUT_DIR named after video_id by OUT_TEMPLATE."""
+    tag = f" - {video_id}."
+    with os.scandir(OUT_DIR) as entries:
+        return [entry.path for entry in entries
+                if entry.is_file() and tag in entry.name
+                and not entry.name.endswith((".part", ".ytdl")) and ".part-Frag" not in entry.name]
+
+async def upload_downloads_to_drive(min_age: float = 0, finished: Iterable[str] = ()):
+    """
+    Moves finished files in OUT_DIR to Google Drive with a single rclone run: the
+    recordings yt-dlp reported as done (finished) plus anything else that is ready
+    (e.g. recordings that were interrupted before yt-dlp reported a final file).
+    Only those files are handed to rclone, so it never walks the whole directory.
+    Assumes rclone is configured via environment variables from the workflow.
+    """
+    async with _upload_lock:
+        names = {os.path.relpath(path, OUT_DIR) for path in finished if os.path.exists(path)}
+        files = sorted(names.union(await _ready_files(min_age)))
+        if not files:
+            log.debug("Nothing ready to upload in %s.", OUT_DIR)
+            return
+        log.info(f"Attempting to upload {len(files)} file(s) from {OUT_DIR} to GDrive...")
+        fd, files_from = tempfile.mkstemp(prefix="rclone-files-", suffix=".txt")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("\n".join(files) + "\n")
+            await _run_rclone(["--files-from-raw", files_from])
+        finally:
+            os.remove(files_from)
+
+def next_poll_delay(status: str, scheduled_start: Optional[float] = None, idle_polls: int = 0) -> float:
+    """
+    Seconds to wait before the next channel scan.
+    Upcoming streams with a known start time are polled sparsely while far away and
+    densely near the start; idle states back off exponentially with each repeat.
+    """
+    if status == "upcoming" and scheduled_start:
+        delta = scheduled_start - time.time()
+        if delta < IMMINENT_WINDOW:
+            # Stay dense around the start, but don't hammer a stream that is running very late
+            return IMMINENT_POLL_INTERVAL if delta > -QUIET_LOG_INTERVAL else CHECK_INTERVAL
+        return min(max(delta / 8, UPCOMING_POLL_MIN), UPCOMING_POLL_MAX)
+    if status in ("not_live", "no_video"):
+        return min(CHECK_INTERVAL * 2 ** min(idle_polls, 10), IDLE_BACKOFF_MAX)
+    return CHECK_INTERVAL
+
+async def follow_recording(proc: asyncio.subprocess.Process, video_id: str, recorded_files: List[str]) -> bool:
+    """
+    Echoes yt-dlp progress until the recorder exits, printing a heartbeat every HEARTBEAT_INTERVAL.
+    Nothing polls: the loop wakes only for a new output line or a timer. Output is read to
+    EOF before waiting on the exit, so the final lines of a burst are never dropped.
+    Final file paths reported by yt-dlp are appended to recorded_files.
+    Returns False if MAX_RUN_SECONDS ran out before the recorder finished.
+    """
+    reader_task: Optional[asyncio.Task] = asyncio.create_task(proc.stdout.readline())
+    next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+    last_print = 0.0
+    try:
+        while reader_task:
+            if end_time and seconds_left() <= 0:
+                print()
+                return False
+            done, _ = await asyncio.wait({reader_task}, timeout=max(min(next_heartbeat - time.monotonic(), seconds_left()), 0))
+            if reader_task in done:
+                raw = reader_task.result()
+                # An empty read means EOF: the recorder has closed its output
+                reader_task = asyncio.create_task(proc.stdout.readline()) if raw else None
+                output = raw.decode(errors="replace").strip()
+                if output.startswith(RECORDED_MARKER):
+                    recorded_files.append(output[len(RECORDED_MARKER):])
+                now_mono = time.monotonic()
+                if now_mono - last_print >= PROGRESS_PRINT_INTERVAL and "[download]" in output and "Destination:" not in output:
+                    # Redrawn in place with \r, so this bypasses logging
+                    print(f"\r[{time.strftime('%Y-%m-%d %H:%M:%S')}] {output}", end="  ", flush=True)
+                    last_print = now_mono
+            if time.monotonic() >= next_heartbeat:
+                print()  # finish the progress line
+                log.info(f"Heartbeat: Recording for video {video_id} is still in progress...")
+                next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+    finally:
+        if reader_task:
+            reader_task.cancel()
+    try:
+        await asyncio.wait_for(proc.wait(), timeout=seconds_left() if end_time else None)
+    except asyncio.TimeoutError:
+        print()
+        return False
+    print()  # Print a newline after download completes
+    return True
+
+async def watch_loop():
+    """Monitors the channel and manages recording with a two-step check."""
+    current_proc: Optional[asyncio.subprocess.Process] = None
+    current_vid_id: Optional[str] = None
+    current_started: float = 0.0
+    failed_vid_id: Optional[str] = None
+    failed_runs: int = 0
+    seen_upcoming: Set[str] = set()  # videos this process (or a previous run, via the meta cache) saw before they went live
+    last_logged_state: str = "initial"
+    last_poll_state: str = "initial"
+    idle_polls: int = 0
+    last_logged_time: datetime = datetime.fromtimestamp(0)
+    recorded_files: List[str] = []
+    pending_uploads: Set[str] = set()
+    upload_pending = asyncio.Event()
+    uploader_task: Optional[asyncio.Task] = None
+    batch_task: Optional[asyncio.Task] = None
+    next_sweep = time.monotonic() + UPLOAD_SWEEP_INTERVAL
+
+    async def uploader():
+        """
+        Background task: waits for upload requests and coalesces each burst into one
+        rclone run, so monitoring (and new recordings) carry on while it uploads.
+        """
+        nonlocal batch_task
+        while True:
+            await upload_pending.wait()
+            await asyncio.sleep(UPLOAD_BATCH_WINDOW)
+            upload_pending.clear()
+            finished = list(pending_uploads)
+            pending_uploads.clear()
+            batch_task = asyncio.create_task(upload_downloads_to_drive(UPLOAD_READY_MIN_AGE, finished))
+            try:
+                # Shielded so shutdown waits for this run instead of orphaning rclone
+                await asyncio.shield(batch_task)
+            except Exception as e:
+                log.error(f"UNEXPECTED ERROR in uploader: {e}")
+
+    async def finish_uploads():
+        if not UPLOAD_ENABLED:
+            return
+        if uploader_task:
+            uploader_task.cancel()
+        if batch_task and not batch_task.done():
+            log.info("Waiting for the background upload to finish...")
+            await asyncio.gather(batch_task, return_exceptions=True)
+        await upload_downloads_to_drive(finished=pending_uploads)
+
+    async def stop_current_recording():
+        nonlocal current_proc, current_vid_id
+        if current_proc:
+            log.info(f"Terminating recording for {current_vid_id}...")
+            try:
+                # Signal the group even if yt-dlp already exited, to reap a lingering ffmpeg
+                _signal_recorder(current_proc)
+                if current_proc.returncode is None:
+                    try:
+                        await asyncio.wait_for(current_proc.wait(), timeout=5)
+                    except asyncio.TimeoutError:
+                        log.warning(f"Process for {current_vid_id} did not terminate gracefully, killing...")
+                        _signal_recorder(current_proc, force=True)
+                        await current_proc.wait()
+            except Exception as e:
+                log.error(f"Error while stopping process: {e}")
+            finally:
+                log.info(f"Recording for {current_vid_id} stopped.")
+                current_proc = None
+                current_vid_id = None
+
+    main_task = asyncio.current_task()
+
+    def handle_signal(signum: signal.Signals):
+        print()
+        log.info(f"Received {signum.name}. Exiting gracefully...")
+        main_task.cancel()
+
+    # The recorder runs in its own session, so a SIGTERM (e.g. a cancelled CI job) only
+    # reaches it through stop_current_recording(); handle it exactly like Ctrl+C
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, handle_signal, signum)
+        except NotImplementedError:
+            pass  # Windows: asyncio.run() cancels the main task on Ctrl+C instead
+    log.info(f"Monitoring YouTube channel: {CHANNEL_URL}")
+    if UPLOAD_ENABLED:
+        uploader_task = asyncio.create_task(uploader())
+
+    try:
+        while True:
+            if end_time and datetime.now() >= end_time:
+                log.info("Reached MAX_RUN_SECONDS limit. Exiting loop.")
+                if current_proc:
+                    await stop_current_recording()
+                await finish_uploads()
+                break
+
+            if UPLOAD_ENABLED and time.monotonic() >= next_sweep:
+                upload_pending.set()
+                next_sweep = time.monotonic() + UPLOAD_SWEEP_INTERVAL
+
+            try:
+                # 1. Handle a recorder that has exited (follow_recording returns once it has)
+                if current_proc and current_proc.returncode is not None:
+                    log.info(f"Recorder for {current_vid_id} exited with code {current_proc.returncode}.")
+                    ended_vid_id = current_vid_id
+                    failed = current_proc.returncode != 0 or time.monotonic() - current_started < RECORDER_MIN_RUN
+                    if UPLOAD_ENABLED and current_proc.returncode == 0 and not recorded_files:
+                        # Without the after_move line the file would wait for UPLOAD_READY_MIN_AGE or the sweep
+                        log.warning(f"WARNING: Recorder for {current_vid_id} reported no final file; uploading files named after it.")
+                        recorded_files.extend(recordings_of(current_vid_id))
+                    await stop_current_recording()
+                    if UPLOAD_ENABLED:
+                        pending_uploads.update(recorded_files)
+                        upload_pending.set()
+                    recorded_files.clear()
+                    last_logged_state = "stopped"
+                    # Whatever ended the recording may have changed the stream's status
+                    invalidate_scan_cache()
+                    if failed:
+                        # Back off before relaunching, so a recorder that fails at once can't respawn in a tight loop
+                        failed_runs = failed_runs + 1 if ended_vid_id == failed_vid_id else 1
+                        failed_vid_id = ended_vid_id
+                        retry_in = min(CHECK_INTERVAL * 2 ** (failed_runs - 1), IDLE_BACKOFF_MAX)
+                        log.info(f"Recorder for {ended_vid_id} failed or ended early; checking again in {retry_in} s.")
+                        await asyncio.sleep(min(retry_in, seconds_left()))
+                        continue
+                    failed_vid_id = None
+                    failed_runs = 0
+
+                # 2. If not recording, scan for a live stream
+                channel_info = await get_video_info(CHANNEL_URL, deep_scan=False)
+                candidate_vid_id = channel_info.get("video_id")
+
+                if not candidate_vid_id:
+                    if last_logged_state != "no_video" or (datetime.now() - last_logged_time).total_seconds() > QUIET_LOG_INTERVAL:
+                        log.info("No video found on channel page. Waiting...")
+                        last_logged_state = "no_video"
+                        last_logged_time = datetime.now()
+                    idle_polls = idle_polls + 1 if last_poll_state == "no_video" else 0
+                    last_poll_state = "no_video"
+                    await asyncio.sleep(min(next_poll_delay("no_video", idle_polls=idle_polls), seconds_left()))
+                    continue
+
+                # 3. Perform a DEEP scan on the candidate video, unless it is known to start well after now
+                video_url = f"https://www.youtube.com/watch?v={candidate_vid_id}"
+                if candidate_vid_id in _meta_cache:
+                    seen_upcoming.add(candidate_vid_id)
+                known = known_upcoming(candidate_vid_id) if channel_info.get("page_upcoming") else None
+                if known:
+                    final_status_info = known
+                else:
+                    final_status_info = await get_video_info(video_url, deep_scan=True)
+                    remember_status(final_status_info)
+                status = final_status_info.get("status")
+                if status == "upcoming":
+                    seen_upcoming.add(candidate_vid_id)
+                scheduled_start = final_status_info.get("scheduled_start_time")
+                title = final_status_info.get("title", f"Video {candidate_vid_id}")
+
+                # 4. Act on the final status
+                if status == "live":
+                    if candidate_vid_id != current_vid_id:
+                        log.info(f"*** LIVE stream detected: '{title}' ({candidate_vid_id}) ***")
+                        await stop_current_recording()
+
+                        # Rewinding a stream that has run for hours would download the whole backlog first.
+                        # That only applies to joining late (e.g. after a restart): a stream we watched while
+                        # it was upcoming is always recorded from the start, however late we noticed it began.
+                        started_at = final_status_info.get("started_at")
+                        live_for = time.time() - started_at if started_at else 0
+                        from_start = candidate_vid_id in seen_upcoming or live_for <= LIVE_FROM_START_MAX_LAG
+                        if not from_start:
+                            log.info(f"Stream has been live for {int(live_for // 60)} min; recording from now instead of from the start.")
+                        current_proc = await start_record(video_url, from_start)
+                        if current_proc:
+                            log.info("Recording process started successfully.")
+                            current_vid_id = candidate_vid_id
+                            current_started = time.monotonic()
+                            last_logged_state = "recording"
+                            last_logged_time = datetime.now()
+
+                            if await follow_recording(current_proc, candidate_vid_id, recorded_files):
+                                continue  # recorder exited: step 1 handles it and queues the upload right away
+                            log.info("MAX_RUN_SECONDS reached during recording. Stopping.")
+                        else:
+                            log.error(f"ERROR: Failed to start recording process for {candidate_vid_id}.")
+                            last_logged_state = "error"
+                else:
+                    log_key = f"waiting_{candidate_vid_id}"
+                    if last_logged_state != log_key or (datetime.now() - last_logged_time).total_seconds() > QUIET_LOG_INTERVAL:
+                        scheduled_msg = f" for {datetime.fromtimestamp(scheduled_start)}" if scheduled_start else ""
+                        msg_map = {
+                            "upcoming": f"UPCOMING stream scheduled{scheduled_msg}: '{title}'. Waiting...",
+                            "not_live": f"No live stream. Last checked: '{title}'. Waiting...",
+                            "error": f"ERROR checking '{title}': {final_status_info.get('errmsg')}"
+                        }
+                        log.info(msg_map.get(status, f"Unknown status: {status}. Waiting..."))
+                        last_logged_state = log_key
+                        last_logged_time = datetime.now()
+
+                # 5. Adapt the next poll to what we just learned; any state change resets the back-off
+                poll_state = f"{status}_{candidate_vid_id}"
+                if poll_state == last_poll_state:
+                    idle_polls += 1
+                else:
+                    # The candidate or its status changed; make the next channel scan fresh
+                    idle_polls = 0
+                    invalidate_scan_cache(CHANNEL_URL)
+                last_poll_state = poll_state
+                await asyncio.sleep(min(next_poll_delay(status, scheduled_start, idle_polls), seconds_left()))
+
+            except Exception as e:
+                log.error(f"An unexpected error occurred in watch_loop: {e}")
+                await asyncio.sleep(CHECK_INTERVAL * 2)
+    except asyncio.CancelledError:
+        await stop_current_recording()
+        await finish_uploads()
+        sys.exit(0)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Record a YouTube channel's live streams as they start.")
+    parser.add_argument("--upload", action=argparse.BooleanOptionalAction, default=UPLOAD_ENABLED,
+                        help="move finished recordings to Google Drive with rclone (env: UPLOAD_ENABLED=1)")
+    parser.add_argument("--channel-url", default=CHANNEL_URL,
+                        help="channel /live URL to monitor (env: CHANNEL_URL)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.upload and not _RCLONE_BIN:
+        sys.exit("ERROR: --upload needs rclone, but it was not found on PATH.")
+    UPLOAD_ENABLED = args.upload
+    CHANNEL_URL = args.channel_url
+    log.info("YouTube Live Auto-Downloader started. Press Ctrl+C to stop.")
+    try:
+        asyncio.run(watch_loop())
+    except (SystemExit, KeyboardInterrupt):
+        log.info("Exiting YouTube Live Auto-Downloader.")